@@ -24,6 +24,8 @@
 #
 
 
+import fnmatch
+import functools
 import getpass
 import grp
 import os
@@ -35,6 +37,15 @@ READ = 4
 WRITE = 2
 EXECUTE = 1
 
+# Precomputed (user, group, other) mode bit constants for each permission
+# type, so that test_file_mode() can select its bits with a single dict
+# lookup instead of an if/elif chain.
+_PERM_BITS = {
+    READ: (stat.S_IRUSR, stat.S_IRGRP, stat.S_IROTH),
+    WRITE: (stat.S_IWUSR, stat.S_IWGRP, stat.S_IWOTH),
+    EXECUTE: (stat.S_IXUSR, stat.S_IXGRP, stat.S_IXOTH),
+}
+
 
 class TealPosixPath(pathlib.PosixPath):
     '''
@@ -42,14 +53,39 @@ class TealPosixPath(pathlib.PosixPath):
     file tests that are not present in the base library version. Objects of
     this type can be used anywhere path-like objects are permitted in Python.
     '''
+    # Cache slots for the stat(2) result and process credentials. These are
+    # populated lazily by test_file_mode() and cleared by invalidate_cache().
+    # Note that pathlib constructs path objects through several internal code
+    # paths that bypass __init__, so these slots are accessed with try/except
+    # rather than being initialized up front.
+    __slots__ = ('_stat_cache', '_euid', '_egid', '_groups')
+
     def __init__(self, *pathsegments):
         '''
         Constructor.
 
         *pathsegments   --  Path segments used for initialization
+
+        The segments themselves are consumed by pathlib during object
+        construction (in __new__), so they are not forwarded here.
         '''
-        pathlib.PosixPath.__init__(*pathsegments)
+        pathlib.PosixPath.__init__(self)
     #
+    def invalidate_cache(self):
+        '''
+        Clears any cached stat(2) result and credential information held by
+        this object. The test_file_mode() method caches this information the
+        first time it is needed, so that repeated permission tests against
+        the same path avoid redundant system calls. Callers that modify the
+        file (or the process credentials) between tests should invalidate
+        the cache to force fresh lookups.
+        '''
+        for attr in TealPosixPath.__slots__:
+            try:
+                delattr(self, attr)
+            except AttributeError:
+                pass
+    #########
     def test_file_mode(self, permission):
         '''
         Tests file mode against the effective user and group IDs to determine
@@ -61,122 +97,156 @@ class TealPosixPath(pathlib.PosixPath):
         result = False
 
         # Begin by determining which bits in the file mode we need to check.
-        u_const = stat.S_IRUSR
-        g_const = stat.S_IRGRP
-        o_const = stat.S_IROTH
-
-        if permission == WRITE:
-            u_const = stat.S_IWUSR
-            g_const = stat.S_IWGRP
-            o_const = stat.S_IWOTH
-        elif permission == EXECUTE:
-            u_const = stat.S_IXUSR
-            g_const = stat.S_IXGRP
-            o_const = stat.S_IXOTH
-        elif permission != READ:
+        try:
+            u_const, g_const, o_const = _PERM_BITS[permission]
+        except KeyError:
             raise OSError('Invalid permission type')
         #
 
-        # Overall bitmask used for checking root execute permissions
-        all_bits = u_const | g_const | o_const
-
         try:
-            if self.exists():
-                # Since the purpose of this library is to support an alternative to
-                # writing shell scripts, follow the behavior of what most shells
-                # would do, and check the effective user and group IDs. This differs
-                # from the behavior of the access(2) system call.
-                uid = os.geteuid()
-                gid = os.getegid()
-
-                s = self.stat()
-                owner = s.st_uid
-                group = s.st_gid
-                mode = s.st_mode
-
-                if uid == 0:
-                    # Special rules exist for root
-                    if permission in (READ, WRITE):
-                        # root can read and write anything
-                        result = True
-                    else:
-                        # If any execute permission bit is set, then root can execute
-                        # the file as well
-                        if mode & all_bits:
-                            result = True
-                        #
-                    #
-                else:
-                    # Non-root uid
-                    if owner == uid:
-                        # If the current effective uid is the owner of the file, we
-                        # only need to match the user permission bits.
-                        if mode & u_const:
-                            result = True
-                        #
-                    else:
-                        # For groups, things are a little bit more complex. If our
-                        # egid is the same as the file's gid, we have a case similar
-                        # to user matching. However, we also need to check membership
-                        # in supplemental groups.
-                        group_matched = False
-                        if group == gid:
-                            group_matched = True
-                            if mode & g_const:
-                                result = True
-                            #
-                        else:
-                            for grp in os.getgroups():
-                                if group == grp:
-                                    group_matched = True
-                                    if mode & g_const:
-                                        result = True
-                                        break
-                        #############
-
-                        # If the file's group doesn't match any group with which the
-                        # user is associated, check the "other" permissions
-                        if not group_matched:
-                            if mode & o_const:
-                                result = True
-            #################
-        except PermissionError as e:
-            pass   # just return False
+            # Use the cached stat result if one is available, performing (and
+            # caching) a fresh stat(2) otherwise. A nonexistent path raises
+            # FileNotFoundError here, which replaces a separate exists() call
+            # and its redundant path lookup.
+            try:
+                s = self._stat_cache
+            except AttributeError:
+                s = self._stat_cache = self.stat()
+            #
+
+            # If the requested permission bit is set for all three classes
+            # (user, group, and other), the answer is True no matter which
+            # identity class applies to us, so the credential syscalls can
+            # be skipped entirely. This covers the common world-accessible
+            # cases like 0644 files and 0755 executables.
+            everyone = u_const | g_const | o_const
+            if (s.st_mode & everyone) == everyone:
+                return True
+            #
+
+            # Since the purpose of this library is to support an alternative to
+            # writing shell scripts, follow the behavior of what most shells
+            # would do, and check the effective user and group IDs. This differs
+            # from the behavior of the access(2) system call. The credentials
+            # are cached alongside the stat result, since they do not normally
+            # change over the life of the process.
+            try:
+                uid = self._euid
+                gid = self._egid
+            except AttributeError:
+                uid = self._euid = os.geteuid()
+                gid = self._egid = os.getegid()
+                self._groups = frozenset(os.getgroups())
+            #
+
+            owner = s.st_uid
+            group = s.st_gid
+            mode = s.st_mode
+
+            if uid == 0:
+                # Special rules exist for root: reads and writes always
+                # succeed, while execution requires at least one execute
+                # permission bit to be set somewhere in the mode. The lazy
+                # "or" skips the bitmask entirely for reads and writes.
+                result = (permission != EXECUTE) or bool(mode & (u_const | g_const | o_const))
+            else:
+                # Non-root uid. Exactly one of the user, group, or other bit
+                # constants applies: the user bits when the effective uid owns
+                # the file, otherwise the group bits when the file's group
+                # matches the egid or any cached supplemental group, and the
+                # other bits when neither identity matches. Rather than
+                # walking nested if/else arms, build the applicable mask
+                # arithmetically and test it with a single bitwise check.
+                owner_match = (owner == uid)
+                group_match = (group == gid) or (group in self._groups)
+                check = ((u_const * owner_match)
+                         | (g_const * (group_match and not owner_match))
+                         | (o_const * (not owner_match and not group_match)))
+                result = bool(mode & check)
+        #################
+        except OSError:
+            # Any stat failure — nonexistent path, a non-directory path
+            # component, a symlink loop, and the like — is an ordinary
+            # "no" answer for a shell-style test, matching the OSError
+            # handling of pathlib.Path.exists().
+            pass
         #
 
         return result
     #
+    def test_modes(self, mask=READ | WRITE | EXECUTE):
+        '''
+        Tests multiple permissions against the path in a single pass,
+        returning a bitmask containing the subset of the requested
+        permissions that the current process holds. Since the stat(2)
+        result and process credentials are cached on the first test, the
+        combined query costs a single stat and one set of credential
+        lookups instead of one per permission.
+
+        mask   --   Bitwise OR of READ, WRITE, and/or EXECUTE to test
+        '''
+        granted = 0
+        for permission in (READ, WRITE, EXECUTE):
+            if mask & permission and self.test_file_mode(permission):
+                granted |= permission
+        #####
+
+        return granted
+    #
     def is_executable(self):
         '''
         Returns True if this path exists and is executable by the current
         process.
         '''
-        return self.test_file_mode(EXECUTE)
+        return bool(self.test_modes(EXECUTE) & EXECUTE)
     #
     def is_readable(self):
         '''
         Returns True if this path exists and is readable by the current
         process.
         '''
-        return self.test_file_mode(READ)
+        return bool(self.test_modes(READ) & READ)
     #
     def is_writable(self):
         '''
         Returns True if this path exists and is writable by the current
         process.
         '''
-        return self.test_file_mode(WRITE)
+        return bool(self.test_modes(WRITE) & WRITE)
     #
 #
 
 
+@functools.lru_cache(maxsize=256)
+def _cached_path(pathsegments):
+    '''
+    Cached TealPosixPath construction, keyed on the segment tuple. Shell
+    script style code tends to probe the same handful of paths over and
+    over, and pathlib object construction is comparatively expensive.
+    '''
+    return TealPosixPath(*pathsegments)
+#
+
 def path(*pathsegments):
     '''
-    Factory function for easy creation of a TealPosixPath object.
+    Factory function for easy creation of a TealPosixPath object. Recently
+    constructed paths are cached and shared, so two calls with the same
+    segments may return the same object. Any stat information cached on
+    the shared object by earlier tests is dropped before it is returned,
+    so each call observes the current state of the filesystem; only
+    explicit reuse of one object keeps its cached stat result.
 
     *pathsegments   --  Initial path segments
     '''
-    return TealPosixPath(*pathsegments)
+    try:
+        result = _cached_path(pathsegments)
+    except TypeError:
+        # Unhashable segment: just build the path directly
+        return TealPosixPath(*pathsegments)
+    #
+
+    result.invalidate_cache()
+    return result
 #
 
 def cwd():
@@ -201,6 +271,9 @@ def home():
 #
 # These functions provide convenient non-object-oriented ways to run various
 # tests on paths, mirroring the code structure of shell scripts more closely.
+# For the simple type tests, the file mode is checked directly with a single
+# os.stat() or os.lstat() call, avoiding the cost of constructing a full
+# pathlib object for each throwaway query.
 
 def pwd():
     '''
@@ -217,8 +290,23 @@ def glob(pattern, path=None):
     pattern   --  Glob pattern (see the fnmatch module for syntax)
     path      --  Optional base path in which to perform the operation
     '''
+    if '**' not in pattern and '/' not in pattern:
+        # Shallow pattern: a single directory listing filtered through
+        # fnmatch is several times faster than pathlib's glob, which
+        # constructs a path object for every matching entry.
+        base = path if path is not None else os.getcwd()
+        try:
+            names = os.listdir(base)
+        except OSError:
+            # Unlistable base (missing, not a directory, no permission):
+            # pathlib's glob yields nothing for these, so match it
+            return []
+        #
+        return [ os.path.join(base, name) for name in fnmatch.filter(names, pattern) ]
+    #
+
     pathobj = None
-    if result is None:
+    if path is None:
         pathobj = TealPosixPath.cwd()
     else:
         pathobj = TealPosixPath(path)
@@ -226,18 +314,41 @@ def glob(pattern, path=None):
     return [ str(item) for item in pathobj.glob(pattern) ]
 #
 
+def _test_mode_type(path, checker, follow_symlinks=True):
+    '''
+    Stats the given path and applies the given stat module type checker
+    (e.g. stat.S_ISDIR) to the resulting file mode. Returns False if the
+    path does not exist or cannot be statted.
+
+    path             --  Path to test
+    checker          --  Mode test function from the stat module
+    follow_symlinks  --  Use stat(2) if True, lstat(2) if False
+    '''
+    try:
+        s = os.stat(path) if follow_symlinks else os.lstat(path)
+    except OSError:
+        return False
+    #
+    return checker(s.st_mode)
+#
+
 def exists(path):
     '''
     Returns True if the given path exists.
     '''
-    return TealPosixPath(path).exists()
+    try:
+        os.stat(path)
+    except OSError:
+        return False
+    #
+    return True
 #
 
 def is_dir(path):
     '''
     Returns True if the given path is a directory.
     '''
-    return TealPosixPath(path).is_dir()
+    return _test_mode_type(path, stat.S_ISDIR)
 #
 
 def is_file(path):
@@ -245,7 +356,7 @@ def is_file(path):
     Returns True if the given path exists and is a regular file, following
     symbolic links to the destination.
     '''
-    return TealPosixPath(path).is_file()
+    return _test_mode_type(path, stat.S_ISREG)
 #
 
 def is_mount(path):
@@ -253,21 +364,21 @@ def is_mount(path):
     Returns True if the given path is a mount point, meaning that a different
     filesystem is mounted at the given path.
     '''
-    return TealPosixPath(path).is_mount()
+    return os.path.ismount(path)
 #
 
 def is_symlink(path):
     '''
     Returns True if the given path is a symbolic link.
     '''
-    return TealPosixPath(path).is_symlink()
+    return _test_mode_type(path, stat.S_ISLNK, follow_symlinks=False)
 #
 
 def is_socket(path):
     '''
     Returns True if the given path is a Unix socket (follows symbolic links).
     '''
-    return TealPosixPath(path).is_socket()
+    return _test_mode_type(path, stat.S_ISSOCK)
 #
 
 def is_fifo(path):
@@ -275,14 +386,14 @@ def is_fifo(path):
     Returns True if the given path is a FIFO (named pipe). Follows symbolic
     links.
     '''
-    return TealPosixPath(path).is_fifo()
+    return _test_mode_type(path, stat.S_ISFIFO)
 #
 
 def is_block_device(path):
     '''
     Returns True if the given path is a block device (follows symbolic links).
     '''
-    return TealPosixPath(path).is_block_device()
+    return _test_mode_type(path, stat.S_ISBLK)
 #
 
 def is_char_device(path):
@@ -290,7 +401,7 @@ def is_char_device(path):
     Returns True if the given path is a character device (follows symbolic
     links).
     '''
-    return TealPosixPath(path).is_char_device()
+    return _test_mode_type(path, stat.S_ISCHR)
 #
 
 def is_readable(path):
@@ -323,9 +434,10 @@ if __name__ == '__main__':
 
     for entry in sys.argv[1:]:
         p = path(entry)
+        modes = p.test_modes()
         print(entry)
-        print('    Readable:  ', p.is_readable())
-        print('    Writable:  ', p.is_writable())
-        print('    Executable:', p.is_executable())
+        print('    Readable:  ', bool(modes & READ))
+        print('    Writable:  ', bool(modes & WRITE))
+        print('    Executable:', bool(modes & EXECUTE))
     #
 #
@@ -24,10 +24,9 @@
 #
 
 # TODO: improve the process checking features
-# TODO: consider whether or not the race condition, however unlikely, can be
-#       eliminated (perhaps fnctl.flock the lock file when acquiring)
 # TODO: add error handling, in case we don't have permissions for the lock file
 
+import fcntl
 import os
 import pathlib
 
@@ -49,6 +48,8 @@ class PIDLock:
         removed automatically if the system reboots.
         '''
         self.path = pathlib.PosixPath(lockfile)
+        self.fd = None
+        self.locked = False
     #
     def check_lock(self):
         '''
@@ -56,13 +57,24 @@ class PIDLock:
         lock. Returns True if this process already holds the lock, or if no
         other process holds the lock, or if the lock file has become stale.
         Stale lock files are removed automatically.
+
+        Since lock() now acquires the lock atomically with flock(2), this
+        check is advisory and is retained mainly for diagnostics and for
+        cleaning up lock files left behind by crashed processes.
         '''
         result = False
         if self.path.exists():
             this_pid = os.getpid()
-            check_pid = 0
-            with open(self.path, 'r') as fh:
-                check_pid = int(fh.read().strip())
+
+            # Read the PID with a raw file descriptor instead of open(),
+            # which avoids building the buffered text IO stack just to
+            # fetch a small integer. int() tolerates the surrounding
+            # whitespace and the trailing newline.
+            fd = os.open(self.path, os.O_RDONLY)
+            try:
+                check_pid = int(os.read(fd, 32))
+            finally:
+                os.close(fd)
             #
             if this_pid == check_pid:
                 # We already hold the lock
@@ -71,11 +83,17 @@ class PIDLock:
                 # See if we have a stale lock
                 procpath = pathlib.PosixPath('/proc').joinpath(str(check_pid))
                 if procpath.exists():
-                    data = ''
-                    with open(procpath.joinpath('status')) as fh:
-                        data = fh.read()
+                    # The comm file holds just the (at most 16 byte) command
+                    # name, which is far cheaper to read than the full status
+                    # file and cannot produce false matches against other
+                    # status fields.
+                    fd = os.open(procpath.joinpath('comm'), os.O_RDONLY)
+                    try:
+                        data = os.read(fd, 32)
+                    finally:
+                        os.close(fd)
                     #
-                    if 'python' not in data:
+                    if not data.strip().startswith(b'python'):
                         # pid has been reused, so it should be safe to clean up the lock file
                         result = True
                         self.path.unlink(missing_ok=True)
@@ -93,38 +111,79 @@ class PIDLock:
     #
     def lock(self):
         '''
-        Acquires the PID lock by writing the current PID to the lock file. The
-        lock is checked both before and after writing the lock file. There is
-        still a tiny possibility for a race condition if two identical copies
-        of this code run at the same time on different CPU cores.
+        Acquires the lock by taking an exclusive flock(2) on the lock file
+        and then writing the current PID into it. The kernel guarantees the
+        atomicity of the flock operation, which eliminates the race that
+        existed with the earlier check-then-write scheme. The locked file
+        descriptor is held open for the lifetime of the lock, and the PID
+        contents remain available for inspection by check_lock() in other
+        processes.
 
-        Returns True if we successfully wrote the lock file and then read the
-        same PID back from it. A return value of False indicates a possible
-        conflict with another process.
+        Returns True if the lock was acquired (or is already held by this
+        object). A return value of False indicates that another process
+        holds the lock.
         '''
         result = False
-        if self.check_lock():
-            with open(self.path, 'w') as fh:
-                pid = os.getpid()
-                fh.write(str(pid) + '\n')
+        if self.locked:
+            result = True
+        #
+
+        while not result and not self.locked:
+            # Open the path fresh on every attempt. A descriptor kept from
+            # an earlier failed attempt could name an inode that the real
+            # holder has since unlinked, and flocking that orphan would
+            # "succeed" alongside a new holder on the replacement file.
+            self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+
+            try:
+                fcntl.flock(self.fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                # Lock held elsewhere: just return False
+                os.close(self.fd)
+                self.fd = None
+                break
             #
 
-            result = self.check_lock()
-        #
+            # The flock only counts if the descriptor still names the file
+            # at self.path. If the previous holder unlinked it between our
+            # open and the flock, retry against the replacement file.
+            try:
+                current_ino = os.stat(self.path).st_ino
+            except FileNotFoundError:
+                current_ino = None
+            #
+            if os.fstat(self.fd).st_ino != current_ino:
+                os.close(self.fd)
+                self.fd = None
+                continue
+            #
+
+            os.ftruncate(self.fd, 0)
+            os.write(self.fd, bytes(str(os.getpid()) + '\n', 'utf-8'))
+            self.locked = True
+            result = True
+        #####
 
         return result
     #
     def unlock(self):
         '''
-        Checks to see if our PID is the one contained in the lock file. If it
-        is, removes the lock file. Returns True if the lock file removal
-        action is taken, False otherwise.
+        Releases the lock by removing the lock file and then unlocking and
+        closing the lock file descriptor. Returns True if the lock was held
+        and released, False otherwise. Calling unlock() on an object that
+        never acquired the lock is a harmless no-op: the lock file belongs
+        to whichever process does hold the lock and is left untouched.
         '''
         result = False
-
-        # Check that we're the process holding the lock
-        if self.check_lock():
+        if self.locked:
+            # Unlink before releasing the flock, so that no moment exists
+            # in which another process can acquire the lock through a path
+            # that this process is about to remove.
             self.path.unlink(missing_ok=True)
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+            os.close(self.fd)
+            self.fd = None
+            self.locked = False
             result = True
         #
 
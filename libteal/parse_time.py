@@ -23,6 +23,10 @@
 # IN THE SOFTWARE.
 #
 
+import functools
+import re
+
+
 LEAPYEAR = 31622400
 YEAR = 31536000
 MONTH = 2592000
@@ -70,11 +74,28 @@ DEFAULT_UNIT_MAP = {
 
 COLONS = [ DAY, HOUR, MINUTE, SECOND ]
 
+# Tokenizer for time strings. Each alternative captures one token type:
+# a number (with optional decimal point), a candidate unit name, a colon
+# separator, whitespace, or a single invalid character. Unit names are
+# validated against the unit map after matching, so the pattern does not
+# need to be recompiled when custom units are added or removed. The ASCII
+# flag keeps the digit and whitespace classes to their ASCII members,
+# avoiding Unicode-aware classification in the hot tokenizer loop.
+_TIME_TOKEN_RE = re.compile(r'(\d+\.?\d*|\.\d+)|([a-z]+)|(:)|(\s+)|(.)', re.ASCII)
+
 
 class TimeParser:
     def __init__(self):
         self.unit_map = dict(DEFAULT_UNIT_MAP)
         self.colons = list(COLONS)
+
+        # Applications frequently parse the same literal time strings (for
+        # example, configuration values) over and over, so completed parses
+        # are memoized per instance. The generation counter participates in
+        # the cache key and is bumped whenever the unit map changes, which
+        # keeps stale results from surviving add_unit()/del_unit().
+        self._gen = 0
+        self._parse_cached = functools.lru_cache(maxsize=512)(self._parse)
     #
     def resolve_unit(self, unit):
         '''
@@ -127,11 +148,18 @@ class TimeParser:
 
         timestr   --   input time string
         '''
+        return self._parse_cached(timestr, self._gen)
+    #
+    def _parse(self, timestr, gen):
+        '''
+        Parses a time string into seconds. This is the uncached
+        implementation behind get_seconds(); the gen argument exists only
+        to key the memoization cache to the current unit map generation.
+        '''
         total = 0
-        accumulator = ''
         value = 0
-        unit_mode = False
-        space_mode = False
+        have_value = False
+        seen_space = True
 
         total_colons = timestr.count(':')
         if total_colons > len(self.colons):
@@ -139,60 +167,41 @@ class TimeParser:
         #
 
         colon = len(self.colons) - total_colons - 1
-        for char in timestr.lower():
-            if not unit_mode:
-                if char.isdigit() or char == '.':
-                    if space_mode and len(accumulator) > 0:
-                        total += float(accumulator)
-                        value = 0
-                        accumulator = char
-                        space_mode = False
-                    else:
-                        accumulator += char
+        for match in _TIME_TOKEN_RE.finditer(timestr.lower()):
+            number, unit, is_colon, space, invalid = match.groups()
+            if number is not None:
+                if have_value:
+                    # A previous number with no unit attached is treated as
+                    # seconds when the next quantity begins.
+                    if not seen_space:
+                        raise ValueError('Invalid time string: ' + timestr)
                     #
-                else:
-                    if len(accumulator) > 0:
-                        value = float(accumulator)
-                    #
-
-                    if char == ':':
-                        total += value * self.colons[colon]
-                        colon += 1
-                        value = 0
-                        accumulator = ''
-                        space_mode = False
-                    elif char.isspace():
-                        space_mode = True
-                    else:
-                        accumulator = char
-                        space_mode = False
-                        unit_mode = True
-                #####
+                    total += value
+                #
+                value = float(number)
+                have_value = True
+                seen_space = False
+            elif unit is not None:
+                total += value * self.resolve_unit(unit)
+                value = 0
+                have_value = False
+                seen_space = False
+            elif is_colon is not None:
+                total += value * self.colons[colon]
+                colon += 1
+                value = 0
+                have_value = False
+                seen_space = False
+            elif space is not None:
+                seen_space = True
             else:
-                if char.isalpha():
-                    accumulator += char
-                else:
-                    unit = self.resolve_unit(accumulator)
-                    total += value * unit
-                    value = 0
-                    unit_mode = False
-                    if char.isdigit():
-                        accumulator = char
-                    #
-                    else:
-                        accumulator = ''
-                    #
-        #############
+                raise ValueError('Invalid character in time string: ' + invalid)
+        #########
 
-        if unit_mode:
-            # Ended on a unit or potential unit
-            unit = self.resolve_unit(accumulator)
-            total += value * unit
-        else:
-            # Any number left in the accumulator is treated as seconds
-            if len(accumulator) > 0:
-                total += float(accumulator)
-        #####
+        # Any number left over at the end is treated as seconds
+        if have_value:
+            total += value
+        #
 
         return total
     #
@@ -214,6 +223,7 @@ class TimeParser:
         '''
         seconds = self.get_seconds(unit_spec)
         self.unit_map[unit_name] = seconds
+        self._gen += 1
     #
     def del_unit(self, unit_name):
         '''
@@ -222,6 +232,7 @@ class TimeParser:
         unit_name   --  Name of the unit to remove
         '''
         del self.unit_map[unit_name]
+        self._gen += 1
     #
 #
 
@@ -25,8 +25,11 @@
 #
 
 
+import codecs
+import mmap
+
 from io import IOBase, SEEK_SET, SEEK_CUR, SEEK_END
-from os import pread
+from os import fstat, pread, preadv
 
 
 class PeekReader(IOBase):
@@ -74,6 +77,75 @@ class PeekReader(IOBase):
         # We have to maintain our own offset, since the underlying file is
         # potentially in use already for writing
         self.position = 0
+
+        # Size reads in multiples of the filesystem's preferred block size
+        # when it exceeds our 64K floor, issuing fewer syscalls per MB on
+        # filesystems with large natural I/O sizes.
+        try:
+            self.blocksize = max(65536, fstat(self.fd).st_blksize)
+        except (OSError, AttributeError):
+            self.blocksize = 65536
+        #
+
+        # The text flag never changes after construction, so bind read()
+        # and read_to() directly to the matching specialization instead of
+        # testing the flag on every call. Text mode keeps an incremental
+        # decoder so that a read() boundary falling inside a multi-byte
+        # UTF-8 sequence carries the partial bytes into the next call
+        # instead of raising.
+        self._decoder = None
+        if text:
+            self._decoder = codecs.getincrementaldecoder('utf-8')()
+            self.read = self._read_text
+            self.read_to = self._read_to_text
+        else:
+            self.read = self._read_bytes
+            self.read_to = self._read_to_bytes
+        #
+
+        # Attempt to map the file into memory, which lets read_to() scan
+        # directly against the page cache instead of copying chunks out
+        # through pread(2). Zero-length files cannot be mapped yet, but may
+        # become mappable once data is written; pipes, sockets, and other
+        # non-mappable descriptors permanently fall back to the pread path.
+        self._mm = None
+        self._mmap_ok = True
+        try:
+            self._mm = mmap.mmap(self.fd, 0, prot=mmap.PROT_READ)
+        except ValueError:
+            pass   # empty file: retry once data appears
+        except OSError:
+            self._mmap_ok = False
+        #
+    #
+    def _refresh_mmap(self):
+        '''
+        Returns the memory map for the underlying file, remapping first if
+        the file has grown or shrunk since the last call. Returns None if
+        the file cannot currently be mapped, in which case the caller
+        should use the pread-based path.
+        '''
+        if not self._mmap_ok or self.is_closed:
+            return None
+        #
+
+        try:
+            size = fstat(self.fd).st_size
+            if self._mm is None or size != len(self._mm):
+                if self._mm is not None:
+                    self._mm.close()
+                    self._mm = None
+                #
+                self._mm = mmap.mmap(self.fd, 0, prot=mmap.PROT_READ)
+            #
+        except ValueError:
+            return None   # file is still empty
+        except OSError:
+            self._mmap_ok = False
+            return None
+        #
+
+        return self._mm
     #
     def close(self):
         '''
@@ -87,6 +159,10 @@ class PeekReader(IOBase):
         self.is_closed = True
         self.fh = None
         self.fd = None
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        #
     #
     def fileno(self):
         '''
@@ -116,29 +192,52 @@ class PeekReader(IOBase):
         '''
         return not self.is_closed
     #
-    def _read(self, size=65536):
+    def _read(self, size=None, _pread=pread):
         '''
-        Reads at most size bytes from the file descriptor. This is the
-        private implementation that returns a bytestring.
+        Reads at most size bytes (one filesystem block, at least 64K, if
+        size is None) from the file descriptor. This is the private
+        implementation that returns a bytestring. The _pread default
+        argument binds os.pread at definition time, saving a global lookup
+        on every call in line-oriented read loops.
         '''
+        if size is None:
+            size = self.blocksize
+        #
         if not self.is_closed:
-            raw = pread(self.fd, size, self.position)
+            raw = _pread(self.fd, size, self.position)
             self.position += len(raw)
         else:
             raise ValueError('Attempted to read from closed file')
         #
         return raw
     #
-    def read(self, size=65536):
+    def read(self, size=None):
         '''
-        Reads at most size (default 64K) bytes from the file descriptor.
+        Reads at most size bytes (by default one filesystem block, with a
+        64K minimum) from the file descriptor.
         Returns a string if the text property of this object is True,
         otherwise returns a bytestring. Note that the length of the
         returned string is limited to the read size. For multibyte Unicode
         characters, the length of a translated string will be even shorter.
+
+        Instances rebind this name to the matching specialization at
+        construction time; this generic version only dispatches.
         '''
-        raw = self._read(size)
-        return str(raw, 'utf-8') if self.text else raw
+        return self._read_text(size) if self.text else self._read_bytes(size)
+    #
+    def _read_bytes(self, size=None):
+        '''
+        Specialized read() for byte mode.
+        '''
+        return self._read(size)
+    #
+    def _read_text(self, size=None):
+        '''
+        Specialized read() for text mode. Decoding is incremental, so a
+        multi-byte UTF-8 sequence split across two reads is held over and
+        completed by the next call rather than raising.
+        '''
+        return self._decoder.decode(self._read(size))
     #
     def read_to(self, size=-1, sentinel=None):
         '''
@@ -163,47 +262,192 @@ class PeekReader(IOBase):
 
         This method returns a bytestring or a Unicode string depending on
         the text property of the PeekReader object.
+
+        Instances rebind this name to the matching specialization at
+        construction time; this generic version only dispatches.
+        '''
+        if self.text:
+            return self._read_to_text(size, sentinel)
+        #
+        return self._read_to_bytes(size, sentinel)
+    #
+    def _read_to_bytes(self, size=-1, sentinel=None):
+        '''
+        Specialized read_to() for byte mode.
+        '''
+        return bytes(self._read_to(size, sentinel))
+    #
+    def _read_to_text(self, size=-1, sentinel=None):
+        '''
+        Specialized read_to() for text mode.
+        '''
+        return str(self._read_to(size, sentinel), 'utf-8')
+    #
+    def _read_to(self, size=-1, sentinel=None):
+        '''
+        Private implementation behind read_to() and readlines(). Reads
+        subject to the same size and sentinel rules, but always returns
+        the accumulated bytearray without any Unicode conversion.
         '''
+        if self.is_closed:
+            raise ValueError('Attempted to read from closed file')
+        #
+
+        # Fast path: scan the memory-mapped file directly, letting find()
+        # run over the page cache with no intermediate chunk copies. This
+        # also means a sentinel can never be missed by falling across a
+        # chunk boundary.
+        mm = self._refresh_mmap()
+        if mm is not None:
+            start = self.position
+            end = len(mm) if size < 0 else min(start + size, len(mm))
+            if sentinel is not None:
+                idx = mm.find(sentinel, start, end)
+                if idx != -1:
+                    end = idx + len(sentinel)
+                #
+            #
+            if end < start:
+                end = start
+            #
+            self.position = end
+            return bytearray(mm[start:end])
+        #
+
+        # Accumulate into a bytearray, which grows amortized O(1) per chunk.
+        # Concatenating bytes objects here would copy the whole buffer on
+        # every iteration, giving quadratic behavior on large reads.
         happy = False
-        full = b''
+        full = bytearray()
+
+        # Number of accumulated tail bytes that must be rescanned together
+        # with each new chunk, so that a sentinel straddling a chunk
+        # boundary is still found.
+        overlap = len(sentinel) - 1 if sentinel is not None else 0
+
+        # Larger chunks amortize the syscall cost per scanned byte when
+        # reading to EOF or hunting for a distant sentinel. Respect the
+        # filesystem's preferred block size, but cap the chunk so a
+        # sentinel scan does not read far past an early match.
+        chunk_size = min(max(self.blocksize, 262144), 1048576)
 
         while not happy:
-            rsize = 65536 if size < 0 else size
+            rsize = chunk_size if size < 0 else size
             chunk = self._read(rsize)
 
             if len(chunk) == 0:
                 # At EOF: nothing to do
                 happy = True
-            elif sentinel is not None and sentinel in chunk:
-                parts = chunk.partition(sentinel)
-                full += parts[0] + sentinel
-                self.position -= len(parts[2])
-                happy = True
             else:
-                if size > 0:
-                    size -= len(chunk)
+                # A single find() both tests for the sentinel and locates
+                # it. The carry bytes prepended from the previous chunk may
+                # contain the start of a sentinel that finishes in this one.
+                idx = -1
+                carry = b''
+                if sentinel is not None:
+                    if overlap > 0 and len(full) > 0:
+                        carry = bytes(full[-overlap:])
+                    #
+                    idx = (carry + chunk).find(sentinel)
                 #
-                full += chunk
+
+                if idx != -1:
+                    # Keep everything through the sentinel, rewinding our
+                    # position by the unconsumed tail so the next read
+                    # resumes just past the sentinel. The slice index is
+                    # always positive, since any carry bytes are already
+                    # part of the accumulated data.
+                    end = idx + len(sentinel) - len(carry)
+                    full.extend(chunk[:end])
+                    self.position -= len(chunk) - end
+                    happy = True
+                else:
+                    if size > 0:
+                        size -= len(chunk)
+                    #
+                    full.extend(chunk)
             #
         #
 
-        return str(full, 'utf-8') if self.text else full
+        return full
     #
     def readall(self):
         '''
         Reads and returns all the content of the underlying file. The
         return type is a Unicode or byte string, depending on the text
         property of the PeekReader object.
+
+        Since the file size gives the exact amount of data to fetch, the
+        content is read with preadv(2) directly into one buffer allocated
+        up front, looping only if the kernel returns a short read. This
+        avoids both the per-chunk bytes objects that pread() returns and
+        the growing accumulation buffer.
         '''
+        if self.is_closed:
+            raise ValueError('Attempted to read from closed file')
+        #
+
         self.seek(0)
-        return self.read_to()
+        try:
+            size = fstat(self.fd).st_size
+        except OSError:
+            # Size unknown (e.g. a pipe): use the generic chunked loop
+            return self.read_to()
+        #
+
+        full = bytearray(size)
+        view = memoryview(full)
+        filled = 0
+        while filled < size:
+            count = preadv(self.fd, [ view[filled:] ], self.position)
+            if count == 0:
+                break
+            #
+            self.position += count
+            filled += count
+        #
+        view.release()
+
+        if filled < size:
+            del full[filled:]
+        #
+
+        return str(full, 'utf-8') if self.text else bytes(full)
     #
     def readline(self, size=-1):
         '''
         Reads and returns one line from the underlying file. If size is
         nonnegative, at most size bytes will be read, even if a partial
         line results. The line separator is b'\\n'.
-        '''
+
+        The common case (an unbounded read of a line shorter than one
+        block) costs a single pread plus one newline scan; longer lines
+        fall back to the general accumulation loop.
+        '''
+        if size < 0:
+            raw = self._read(self.blocksize)
+            if len(raw) == 0:
+                return '' if self.text else b''
+            #
+
+            idx = raw.find(b'\n')
+            if idx != -1:
+                # Rewind past the unconsumed tail and keep the line
+                end = idx + 1
+                self.position -= len(raw) - end
+                raw = raw[:end]
+                return str(raw, 'utf-8') if self.text else raw
+            #
+
+            if len(raw) < self.blocksize:
+                # EOF: the remainder is the final, unterminated line
+                return str(raw, 'utf-8') if self.text else raw
+            #
+
+            # Line longer than one block: rewind and accumulate generally
+            self.position -= len(raw)
+        #
+
         return self.read_to(size=size, sentinel=b'\n')
     #
     def readlines(self, hint=-1):
@@ -211,11 +455,16 @@ class PeekReader(IOBase):
         Reads and returns all lines in the underlying file, starting from
         the current offset. If hint is nonnegative, reads at most hint
         bytes, even if a partial last line results. The line separator
-        depends upon the text processing mode of the PeekReader, since
-        line separation occurs only after all the text has been read and
-        optionally converted to Unicode.
-        '''
-        return self.read_to(size=hint).splitlines()
+        depends upon the text processing mode of the PeekReader. The line
+        splitting always happens on the raw bytes; in text mode, each line
+        is then decoded individually, which avoids holding both the full
+        bytestring and its full Unicode translation in memory at once.
+        '''
+        lines = self._read_to(size=hint).splitlines()
+        if self.text:
+            return [ str(line, 'utf-8') for line in lines ]
+        #
+        return [ bytes(line) for line in lines ]
     #
     def seek(self, offset, whence=SEEK_SET):
         '''
@@ -243,6 +492,12 @@ class PeekReader(IOBase):
             # SEEK_SET
             self.position = offset
         #
+
+        # Any partial multi-byte sequence held by the text decoder belongs
+        # to the old position and must not leak into reads from the new one
+        if self._decoder is not None:
+            self._decoder.reset()
+        #
     #
     def seekable(self):
         '''
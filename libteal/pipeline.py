@@ -24,38 +24,85 @@
 #
 
 
+import functools
 import os
+import select
 import shlex
+import shutil
 import tempfile
+import time
 
+from collections import namedtuple
+from dataclasses import dataclass, field
 from signal import SIGTERM, SIGKILL
-from subprocess import Popen, DEVNULL, PIPE, STDOUT
+from subprocess import Popen, run, DEVNULL, PIPE, STDOUT, TimeoutExpired
 
 
-PIPE_STDOUT = { 'stdout': PIPE, 'stderr': None, 'stream': 1 }
-PIPE_STDERR = { 'stdout': None, 'stderr': PIPE, 'stream': 2 }
-PIPE_BOTH = { 'stdout': PIPE, 'stderr': STDOUT, 'stream': 1 }
-PIPE_STDOUT_QUIET = { 'stdout': PIPE, 'stderr': DEVNULL, 'stream': 1 }
-PIPE_STDERR_QUIET = { 'stdout': DEVNULL, 'stderr': PIPE, 'stream': 2 }
+@functools.lru_cache(maxsize=256)
+def _which(name, path):
+    '''
+    Resolves an executable name against a PATH string, with the results
+    memoized per (name, PATH) pair. Returns None if the name cannot be
+    resolved.
 
+    name   --  Bare executable name (no directory component)
+    path   --  PATH string to search, or None for the default
+    '''
+    return shutil.which(name, path=path)
+#
+
+
+@functools.lru_cache(maxsize=1024)
+def _split_cmd(command):
+    '''
+    Splits a command string into an argument tuple. Strings without any
+    quoting characters take a plain str.split(), which matches shlex
+    output for such input without the per-character Python tokenizer.
+    Results are memoized, since scripts tend to run the same command
+    strings repeatedly.
+
+    command   --  Command line as a single string
+    '''
+    if "'" not in command and '"' not in command and '\\' not in command:
+        return tuple(command.split())
+    #
+    return tuple(shlex.split(command))
+#
+
+
+# Pipe relationship constants. These are immutable named tuples rather
+# than dicts: unpacking one in append() costs no hashing or lookups, and
+# module-level constants cannot be mutated by accident.
+PipeSpec = namedtuple('PipeSpec', ['stdout', 'stderr', 'stream'])
 
+PIPE_STDOUT = PipeSpec(stdout=PIPE, stderr=None, stream=1)
+PIPE_STDERR = PipeSpec(stdout=None, stderr=PIPE, stream=2)
+PIPE_BOTH = PipeSpec(stdout=PIPE, stderr=STDOUT, stream=1)
+PIPE_STDOUT_QUIET = PipeSpec(stdout=PIPE, stderr=DEVNULL, stream=1)
+PIPE_STDERR_QUIET = PipeSpec(stdout=DEVNULL, stderr=PIPE, stream=2)
 
+
+
+@dataclass(slots=True)
 class Command:
-        '''
-        Data structure for holding per-command information.
-        '''
-        command = []
-        cwd = None
-        environ = {}
-        user = None
-        group = None
-        extra_groups = None
-        umask = -1
-        stdin = PIPE
-        stdout = None
-        stderr = None
-        stream = 1
-        subproc = None
+    '''
+    Data structure for holding per-command information. Slots keep the
+    per-instance footprint small for long pipelines, and the factory
+    defaults give each instance its own command list and environment
+    (the old class attributes were shared between instances).
+    '''
+    command: list = field(default_factory=list)
+    cwd: object = None
+    environ: dict = field(default_factory=dict)
+    user: object = None
+    group: object = None
+    extra_groups: object = None
+    umask: int = -1
+    stdin: object = PIPE
+    stdout: object = None
+    stderr: object = None
+    stream: int = 1
+    subproc: object = None
 #
 
 
@@ -111,32 +158,43 @@ class Pipeline:
         #
 
         self.stdin = None
+        self._indata_bytes = None
         if indata:
-            self.stdin = tempfile.TemporaryFile()
-            if type(indata) is str:
-                self.stdin.write(bytes(indata, 'utf-8'))
+            data = bytes(indata, 'utf-8') if type(indata) is str else indata
+            if len(data) <= 65536:
+                # A small payload fits in a kernel pipe buffer, so launch()
+                # can feed it through an os.pipe() without ever touching a
+                # disk-backed temporary file.
+                self._indata_bytes = data
             else:
-                self.stdin.write(indata)
-            #
-            self.stdin.flush()
-            self.stdin.seek(0)
-        #
+                self.stdin = tempfile.TemporaryFile()
+                self.stdin.write(data)
+                self.stdin.flush()
+                self.stdin.seek(0)
+        #####
 
+        # PIPE capture files are allocated lazily in launch(), so a
+        # pipeline that is configured but never run creates nothing.
         self.stdout = stdout
+        self._stdout_pipe = False
         if stdout is PIPE:
-            self.stdout = tempfile.TemporaryFile()
+            self.stdout = None
+            self._stdout_pipe = True
         elif type(stdout) is str:
             self.stdout = open(stdout, 'w+b')
         #
 
         self.stderr = stderr
+        self._stderr_pipe = False
         if stderr is PIPE:
-            self.stderr = tempfile.TemporaryFile()
+            self.stderr = None
+            self._stderr_pipe = True
         elif type(stderr) is str:
             self.stderr = open(stderr, 'w+b')
         #
 
         self.commands = []
+        self.pgid = None
     #
     def append(self, command, cwd=None, base_env=None, export={}, user=None,
                group=None, extra_groups=None, umask=-1, pipe=PIPE_STDOUT):
@@ -174,63 +232,240 @@ class Pipeline:
 
         cmd = Command()
         if type(command) is str:
-            cmd.command = shlex.split(command)
+            cmd.command = list(_split_cmd(command))
         else:
             cmd.command = command
         #
 
         cmd.cwd = self.cwd if cwd is None else cwd
 
-        cmd.environ = dict(self.environ) if base_env is None else dict(base_env)
-        for key in export:
-            cmd.environ[key] = export[key]
-        #
+        if base_env is None and not export:
+            # Nothing overrides the pipeline environment for this command,
+            # so share the dict by reference. Popen does not mutate env, and
+            # copying an os.environ-sized dict per command adds up in long
+            # pipelines.
+            cmd.environ = self.environ
+        else:
+            cmd.environ = dict(self.environ) if base_env is None else dict(base_env)
+            for key in export:
+                cmd.environ[key] = export[key]
+        #####
 
         cmd.user = self.user if user is None else user
         cmd.group = self.group if group is None else group
         cmd.extra_groups = self.extra_groups if extra_groups is None else extra_groups
         cmd.umask = self.umask if umask < 0 else umask
 
-        cmd.stdout = pipe['stdout']
-        cmd.stderr = pipe['stderr']
-        cmd.stream = pipe['stream']
+        if type(pipe) is dict:
+            # Older callers may still pass the pre-PipeSpec dict form
+            pipe = (pipe['stdout'], pipe['stderr'], pipe['stream'])
+        #
+        cmd.stdout, cmd.stderr, cmd.stream = pipe
 
         self.commands.append(cmd)
     #
-    def launch(self):
-        if len(self.commands) > 0:
+    def _capture_file(self, name):
+        '''
+        Creates the backing file for a captured (PIPE) stream. An
+        anonymous in-memory file from memfd_create(2) is preferred, since
+        it needs no filesystem entry and stays in page cache; a regular
+        temporary file is the fallback.
+
+        name   --  Stream label used for the memfd name
+        '''
+        try:
+            fd = os.memfd_create('pipeline-' + name, os.MFD_CLOEXEC)
+            return os.fdopen(fd, 'w+b')
+        except (AttributeError, OSError):
+            return tempfile.TemporaryFile()
+        #
+    #
+    def finalize(self):
+        '''
+        Settles the endpoint streams of the pipeline before launch:
+        allocates any lazily-deferred capture files and points the last
+        command's output streams at the pipeline-level destinations.
+        Called automatically by launch(); calling it again is harmless.
+        '''
+        if self._stdout_pipe and self.stdout is None:
+            self.stdout = self._capture_file('stdout')
+        #
+        if self._stderr_pipe and self.stderr is None:
+            self.stderr = self._capture_file('stderr')
+        #
+
+        if self.commands:
             self.commands[-1].stdout = self.stdout
             self.commands[-1].stderr = self.stderr
+        #
+    #
+    def launch(self):
+        if len(self.commands) > 0:
+            self.finalize()
 
-            index = 0
-            prev_command = None
             stdin = self.stdin
 
-            for item in self.commands:
-                if prev_command:
-                    if prev_command.stream == 2:
-                        stdin = prev_command.subproc.stderr
+            # Small seed data goes through a pipe: the single write fits in
+            # the default 64 KiB kernel pipe buffer, and the read end
+            # becomes the first child's standard input. The write is made
+            # nonblocking because the kernel hands out one-page pipes when
+            # a user is over its pipe-buffer soft limit, and a blocking
+            # write to such a pipe would hang before any child exists to
+            # drain it; an undersized pipe spills to a temporary file,
+            # the same route the constructor takes for large payloads.
+            indata_fd = None
+            if self._indata_bytes is not None:
+                data = self._indata_bytes
+                indata_fd, w = os.pipe()
+                os.set_blocking(w, False)
+                written = 0
+                try:
+                    written = os.write(w, data)
+                except BlockingIOError:
+                    pass
+                #
+                os.close(w)
+
+                if written == len(data):
+                    stdin = indata_fd
+                else:
+                    os.close(indata_fd)
+                    indata_fd = None
+                    spill = tempfile.TemporaryFile()
+                    spill.write(data)
+                    spill.flush()
+                    spill.seek(0)
+                    stdin = spill
+            #####
+
+            # Every inter-stage pipe is created up front with pipe2(2), so
+            # no spawn depends on the Popen object of the previous stage
+            # and the parent releases its copies in one pass at the end.
+            # O_CLOEXEC keeps the raw descriptors from leaking into any
+            # child beyond the dup2'ed ends each stage receives.
+            last = len(self.commands) - 1
+            pipes = [ os.pipe2(os.O_CLOEXEC) for _ in range(last) ]
+
+            for index, item in enumerate(self.commands):
+                if index > 0:
+                    stdin = pipes[index - 1][0]
+                #
+
+                stdout = item.stdout
+                stderr = item.stderr
+                if index < last:
+                    # The write end feeds whichever stream this command
+                    # pipes onward; the other stream keeps its setting.
+                    if item.stream == 2:
+                        stderr = pipes[index][1]
                     else:
-                        stdin = prev_command.subproc.stdout
+                        stdout = pipes[index][1]
                 #####
 
-                item.subproc = Popen(item.command, stdin=stdin,
-                             stdout=item.stdout, stderr=item.stderr,
-                             cwd=item.cwd, env=item.environ, user=item.user,
-                             group=item.group, extra_groups=item.extra_groups,
-                             umask=item.umask)
+                # Only pass the credential-changing keywords when they are
+                # actually in use. Setting uid/gid/umask (even to default
+                # values) disqualifies CPython's vfork-based child spawn,
+                # which avoids duplicating the parent's page tables; a
+                # minimal argument set keeps that cheaper path active.
+                # (posix_spawn proper is out of reach here regardless,
+                # since it cannot set the process group.)
+                kwargs = {}
+                if item.user is not None:
+                    kwargs['user'] = item.user
+                if item.group is not None:
+                    kwargs['group'] = item.group
+                if item.extra_groups is not None:
+                    kwargs['extra_groups'] = item.extra_groups
+                if item.umask >= 0:
+                    kwargs['umask'] = item.umask
                 #
 
-                if prev_command:
-                    if prev_command.stream == 2:
-                        prev_command.subproc.stderr.close()
-                    else:
-                        prev_command.subproc.stdout.close()
+                # Resolve a bare executable name to its absolute path up
+                # front (memoized per name and PATH). The fork/exec path
+                # otherwise probes every PATH directory with a separate
+                # exec attempt in the child, and an absolute path is also
+                # a precondition for subprocess's posix_spawn fast path.
+                # Unresolvable names are left for Popen to report.
+                args = item.command
+                if args and type(args[0]) is str and '/' not in args[0]:
+                    resolved = _which(args[0], item.environ.get('PATH'))
+                    if resolved:
+                        args = [resolved, *args[1:]]
                 #####
 
-                prev_command = item
+                # All children are placed into one process group (led by the
+                # first child), so that signals can later be delivered to
+                # the whole pipeline with a single killpg(2).
+                item.subproc = Popen(args, stdin=stdin,
+                             stdout=stdout, stderr=stderr,
+                             cwd=item.cwd, env=item.environ,
+                             process_group=0 if self.pgid is None else self.pgid,
+                             **kwargs)
+                #
+
+                if self.pgid is None:
+                    self.pgid = item.subproc.pid
+                #
+            #####
+
+            # The children hold their own duplicates of every pipe end now
+            if indata_fd is not None:
+                os.close(indata_fd)
+            #
+            for r, w in pipes:
+                os.close(r)
+                os.close(w)
+            #
+        #
+    #
+    def _drain(self, src, dst):
+        '''
+        Copies the full contents of a captured stream to a destination
+        using sendfile(2), which moves the data inside the kernel without
+        routing it through Python-level buffers. Returns the number of
+        bytes copied, or 0 if the stream was not captured.
+
+        src   --  Captured stream (file object or descriptor), or None
+        dst   --  Destination file object or descriptor
+        '''
+        if src is None:
+            return 0
+        #
+
+        src_fd = src if type(src) is int else src.fileno()
+        dst_fd = dst if type(dst) is int else dst.fileno()
+
+        size = os.fstat(src_fd).st_size
+        sent = 0
+        while sent < size:
+            count = os.sendfile(dst_fd, src_fd, sent, size - sent)
+            if count == 0:
+                break
             #
+            sent += count
         #
+
+        return sent
+    #
+    def drain_stdout(self, dst):
+        '''
+        Copies the captured standard output of the pipeline to the given
+        destination (a file object or file descriptor) via sendfile(2),
+        returning the number of bytes copied. Only meaningful when the
+        pipeline was created with stdout=PIPE or a filename. Note that the
+        copy bypasses any userspace buffering on the destination, so flush
+        the destination first if it has buffered data pending.
+        '''
+        return self._drain(self.stdout, dst)
+    #
+    def drain_stderr(self, dst):
+        '''
+        Copies the captured standard error of the pipeline to the given
+        destination (a file object or file descriptor) via sendfile(2),
+        returning the number of bytes copied. See drain_stdout() for
+        caveats.
+        '''
+        return self._drain(self.stderr, dst)
     #
     def is_running(self):
         '''
@@ -238,10 +473,10 @@ class Pipeline:
         '''
         result = False
         for item in self.commands:
-            if item.subproc:
-                if item.subproc.poll() is None:
-                    result = True
-                    break
+            proc = item.subproc
+            if proc and proc.returncode is None and proc.poll() is None:
+                result = True
+                break
         #########
 
         return result
@@ -254,16 +489,110 @@ class Pipeline:
         the return code if the subprocess has finished, or False if the
         subprocess has not yet been created.
         '''
+        # One waitid(2) on the pipeline's own process group answers "has
+        # any stage exited?" for the whole pipeline, so a quiet poll costs
+        # a single syscall instead of one waitpid per live stage. WNOWAIT
+        # leaves each exited child reapable, and the matching Popen then
+        # reaps it so its return code is recorded. The group is private to
+        # this pipeline, so no unrelated children can be disturbed.
+        if self.pgid is not None and hasattr(os, 'waitid'):
+            try:
+                flags = os.WNOHANG | os.WEXITED | os.WNOWAIT
+                while True:
+                    info = os.waitid(os.P_PGID, self.pgid, flags)
+                    if info is None:
+                        break
+                    #
+                    dispatched = False
+                    for item in self.commands:
+                        proc = item.subproc
+                        if proc and proc.pid == info.si_pid and proc.returncode is None:
+                            proc.poll()
+                            dispatched = True
+                            break
+                    #########
+                    if not dispatched:
+                        break
+                #####
+
+                # Every exited stage has now been reaped, so a stage with
+                # no cached return code is still running.
+                result = []
+                for item in self.commands:
+                    proc = item.subproc
+                    result.append(proc.returncode if proc else False)
+                #
+                return result
+            except (ChildProcessError, OSError):
+                pass   # all stages reaped already: fall through
+        #####
+
         result = []
         for item in self.commands:
-            if item.subproc:
-                result.append(item.subproc.poll())
+            proc = item.subproc
+            if proc:
+                # A stage that has already been reaped keeps its return
+                # code on the Popen object; consulting it directly skips
+                # the poll() call (and its waitpid syscall) for every
+                # finished stage on repeated polls.
+                code = proc.returncode
+                result.append(code if code is not None else proc.poll())
             else:
                 result.append(False)
         #####
 
         return result
     #
+    def _wait_pidfd(self, timeout):
+        '''
+        Waits for every launched subprocess using pidfd_open(2) descriptors
+        registered with a single poll(2) set. The kernel wakes the poll
+        exactly when a child exits, so the wait consumes no CPU and has no
+        polling granularity, and one deadline covers the whole pipeline.
+        Raises TimeoutExpired if the deadline passes with stages still
+        running, and OSError if pidfd_open is unavailable on this kernel.
+
+        timeout   --  Deadline in seconds, or None to wait forever
+        '''
+        poller = select.poll()
+        pending = {}
+        try:
+            for item in self.commands:
+                proc = item.subproc
+                if proc and proc.returncode is None:
+                    fd = os.pidfd_open(proc.pid)
+                    pending[fd] = proc
+                    poller.register(fd, select.POLLIN)
+            #########
+
+            deadline = None
+            if timeout is not None:
+                deadline = time.monotonic() + timeout
+            #
+
+            while pending:
+                remaining = None
+                if deadline is not None:
+                    remaining = max(0, (deadline - time.monotonic()) * 1000)
+                #
+                events = poller.poll(remaining)
+                if not events:
+                    proc = next(iter(pending.values()))
+                    raise TimeoutExpired(proc.args, timeout)
+                #
+                for fd, _ in events:
+                    proc = pending.pop(fd)
+                    poller.unregister(fd)
+                    os.close(fd)
+                    # The pidfd became readable, so the child has already
+                    # exited and this reap cannot block.
+                    proc.wait()
+            #########
+        finally:
+            for fd in pending:
+                os.close(fd)
+        #####
+    #
     def wait(self, timeout=None):
         '''
         Waits for each subprocess to terminate. Returns a list with the
@@ -272,11 +601,28 @@ class Pipeline:
         the value False if the subprocess has not yet been created. An
         optional timeout (in seconds) is available. A TimeoutExpired
         (from the subprocess module) exception is raised if it expires.
+
+        On kernels with pidfd_open(2) (Linux 5.3+), the wait blocks in a
+        single poll(2) covering every stage, so the timeout is a deadline
+        for the pipeline as a whole. On older kernels, the fallback waits
+        on each stage in turn, applying the timeout per stage.
         '''
+        reaped = False
+        if hasattr(os, 'pidfd_open'):
+            try:
+                self._wait_pidfd(timeout)
+                reaped = True
+            except OSError:
+                pass   # pre-5.3 kernel or fd exhaustion: fall back
+        #####
+
         result = []
         for item in self.commands:
             if item.subproc:
-                result.append(item.subproc.wait(timeout))
+                if reaped:
+                    result.append(item.subproc.returncode)
+                else:
+                    result.append(item.subproc.wait(timeout))
             else:
                 result.append(False)
         #####
@@ -286,7 +632,28 @@ class Pipeline:
     def send_signal(self, signal):
         '''
         Sends the specified signal to each subprocess in the pipeline.
+        Since the children share a process group, the signal is normally
+        delivered to all of them with a single killpg(2) call.
         '''
+        # Only use killpg while at least one stage is unreaped: once every
+        # child has been reaped the group id may have been recycled by an
+        # unrelated process group, and signaling it would hit innocents.
+        # An unreaped stage (even a zombie) keeps the group id pinned.
+        live = False
+        for item in self.commands:
+            if item.subproc and item.subproc.returncode is None:
+                live = True
+                break
+        #########
+
+        if live and self.pgid is not None:
+            try:
+                os.killpg(self.pgid, signal)
+                return
+            except ProcessLookupError:
+                pass   # group already gone: fall through to the loop
+        #####
+
         for item in self.commands:
             if item.subproc:
                 item.subproc.send_signal(signal)
@@ -306,6 +673,156 @@ class Pipeline:
 #
 
 
+def subpipe(*commands, indata=None, cwd=None, base_env=None, export={},
+            timeout=None):
+    '''
+    Runs the given commands as a one-shot pipeline, capturing output.
+    Each positional argument is one command, given as a sequence or a
+    string (as in Pipeline.append). Returns a (codes, stdout, stderr)
+    tuple, where codes is the list of return codes and stdout/stderr
+    are the captured bytes of the last command's output streams.
+
+    indata     --  Data to send to the first command (str or bytes)
+    cwd        --  Working directory for the commands
+    base_env   --  Base environment (None for os.environ)
+    export     --  Additional environment variables (dict)
+    timeout    --  Deadline in seconds; raises TimeoutExpired on expiry
+
+    A single command bypasses the Pipeline machinery entirely and runs
+    through subprocess.run, which captures into memory with no backing
+    files — the cheapest path for the most common case.
+    '''
+    if len(commands) == 1:
+        args = commands[0]
+        if type(args) is str:
+            args = list(_split_cmd(args))
+        #
+
+        data = bytes(indata, 'utf-8') if type(indata) is str else indata
+
+        env = None
+        if base_env is not None or export:
+            env = dict(os.environ) if base_env is None else dict(base_env)
+            env.update(export)
+        #
+
+        proc = run(args, input=data, capture_output=True, cwd=cwd, env=env,
+                   timeout=timeout)
+        return ([proc.returncode], proc.stdout, proc.stderr)
+    #
+
+    pipeline = Pipeline(cwd=cwd, base_env=base_env, export=export,
+                        stdout=PIPE, stderr=PIPE, indata=indata)
+    for command in commands:
+        pipeline.append(command)
+    #
+
+    pipeline.launch()
+    try:
+        codes = pipeline.wait(timeout)
+    except TimeoutExpired:
+        # Match the single-command path, where subprocess.run kills the
+        # child before re-raising: take down the stages and release the
+        # capture files so nothing is left running or open.
+        pipeline.kill()
+        pipeline.wait()
+        pipeline.stdout.close()
+        pipeline.stderr.close()
+        raise
+    #
+
+    pipeline.stdout.seek(0)
+    out = pipeline.stdout.read()
+    pipeline.stdout.close()
+
+    pipeline.stderr.seek(0)
+    err = pipeline.stderr.read()
+    pipeline.stderr.close()
+
+    return (codes, out, err)
+#
+
+
+def wait_many(pipelines, timeout=None):
+    '''
+    Waits for several launched pipelines at once. Returns a list with one
+    entry per pipeline, in input order, where each entry is the same
+    return code list that the pipeline's own wait() would produce. An
+    optional timeout (in seconds) is available; a TimeoutExpired (from
+    the subprocess module) exception is raised if it expires.
+
+    pipelines   --  Iterable of launched Pipeline objects
+    timeout     --  Deadline in seconds covering all pipelines, or None
+
+    Every stage of every pipeline is registered in a single poll(2) set
+    via pidfd_open(2), so one blocked syscall covers the whole batch and
+    stages are reaped as they exit with no per-pipeline polling. When
+    pidfds are unavailable (pre-5.3 kernels, or descriptor exhaustion
+    with very large batches), each pipeline is waited on in turn instead.
+    '''
+    pipelines = list(pipelines)
+
+    if hasattr(os, 'pidfd_open'):
+        poller = select.poll()
+        pending = {}
+        try:
+            try:
+                for pipeline in pipelines:
+                    for item in pipeline.commands:
+                        proc = item.subproc
+                        if proc and proc.returncode is None:
+                            fd = os.pidfd_open(proc.pid)
+                            pending[fd] = proc
+                            poller.register(fd, select.POLLIN)
+                #############
+            except OSError:
+                pass   # old kernel or fd exhaustion: sequential fallback
+            else:
+                deadline = None
+                if timeout is not None:
+                    deadline = time.monotonic() + timeout
+                #
+
+                while pending:
+                    remaining = None
+                    if deadline is not None:
+                        remaining = max(0, (deadline - time.monotonic()) * 1000)
+                    #
+                    events = poller.poll(remaining)
+                    if not events:
+                        proc = next(iter(pending.values()))
+                        raise TimeoutExpired(proc.args, timeout)
+                    #
+                    for fd, _ in events:
+                        proc = pending.pop(fd)
+                        poller.unregister(fd)
+                        os.close(fd)
+                        proc.wait()
+                #########
+
+                result = []
+                for pipeline in pipelines:
+                    codes = []
+                    for item in pipeline.commands:
+                        codes.append(item.subproc.returncode if item.subproc else False)
+                    #
+                    result.append(codes)
+                #####
+                return result
+        finally:
+            for fd in pending:
+                os.close(fd)
+        #####
+    #
+
+    result = []
+    for pipeline in pipelines:
+        result.append(pipeline.wait(timeout))
+    #
+    return result
+#
+
+
 if __name__ == '__main__':
     p = Pipeline(stdout=PIPE, indata='Hello, World\n')
     p.append('cat')
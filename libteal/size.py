@@ -23,7 +23,9 @@
 # IN THE SOFTWARE.
 
 
+import functools
 import math
+import re
 
 IEC = {
     'Ki': 10,
@@ -50,6 +52,82 @@ SI = {
 BYTES = 1
 BITS = 8
 
+# Dividends for the standard prefix tables, computed once at import time so
+# that human_size() can look up each divisor instead of exponentiating on
+# every call.
+_IEC_DIVIDENDS = { prefix: 1 << value for prefix, value in IEC.items() }
+_SI_DIVIDENDS = { prefix: 10**value for prefix, value in SI.items() }
+
+# Scanner for size strings: the first group captures the numeric value
+# (digits with an optional decimal part) and the second group captures the
+# letters of the prefix that follows, with optional whitespace in between.
+# Anything before the first digit is skipped, matching the old behavior of
+# the character-by-character scan.
+_SIZE_RE = re.compile(r'(\d+(?:\.\d*)?)\s*([A-Za-z]*)', re.ASCII)
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_size(size_string):
+    '''
+    Parses a human-readable size string into a byte count. Results are
+    memoized at module level, since applications tend to parse the same
+    literal size strings (configuration values and the like) repeatedly.
+    '''
+    accumulator = ''
+    prefix = ''
+    unit = BYTES
+
+    # Scan for the numeric value and its prefix in a single pass of the
+    # compiled regex, which runs in C instead of branching per character
+    # at the Python level.
+    match = _SIZE_RE.search(size_string)
+    if match:
+        accumulator, prefix = match.group(1, 2)
+    #
+
+    # Check for Bytes/bits
+    if len(prefix) > 0:
+        if prefix[-1] == 'b':
+            prefix = prefix[:-1]
+            unit = BITS
+        elif prefix[-1] in ('B', 'o'):
+            # Bytes/octets
+            prefix = prefix[:-1]
+    #####
+
+    # Special hack for a capital K: replace with Ki. In the early days of
+    # computing, K (capitalized) unambiguously distinguished the power of
+    # two value (modern Kibi) from its SI equivalent (kilo).
+    if prefix == 'K':
+        prefix = 'Ki'
+    #
+
+    size = 0
+    if len(accumulator) > 0:
+        size = float(accumulator)
+    #
+
+    if prefix in IEC:
+        size *= _IEC_DIVIDENDS[prefix]
+    elif prefix in SI:
+        size *= _SI_DIVIDENDS[prefix]
+    #
+
+    size = int(size)
+
+    # Workaround for fractional bits and bits that don't align with
+    # byte boundaries:
+    if unit == BITS:
+        total = size // BITS
+        if size % BITS != 0:
+            total += 1
+        #
+        size = total
+    #
+
+    return size
+#
+
 
 class DataSize:
     def __init__(self, start_size=0):
@@ -63,78 +141,12 @@ class DataSize:
     def parse_size(self, size_string):
         '''
         Parses a human-readable size string and sets the size of the current
-        object to the result.
+        object to the result. Repeated parses of the same string are served
+        from a module-level cache.
 
         size_string   --   size string to parse (e.g. 125.2 K)
         '''
-        accumulator = ''
-        dp = False
-        prefix = ''
-        unit = BYTES
-
-        # Iterate through the string, accumulating digits and an optional
-        # decimal point. Stop accumulating when non-digit, non-whitespace
-        # characters are found, and use these to find the prefix.
-        for char in size_string:
-            if len(prefix) == 0:
-                if char.isdigit():
-                    accumulator += char
-                elif len(accumulator) > 0:
-                    if char == '.' and not dp:
-                        dp = True
-                        accumulator += char
-                    elif not char.isspace():
-                        prefix = char
-                    #
-                #
-            else:
-                if char.isalpha():
-                    prefix += char
-                else:
-                    # Assume this is the end of the size
-                    break
-        #########
-
-        # Check for Bytes/bits
-        if len(prefix) > 0:
-            if prefix[-1] == 'b':
-                prefix = prefix[:-1]
-                unit = BITS
-            elif prefix[-1] in ('B', 'o'):
-                # Bytes/octets
-                prefix = prefix[:-1]
-        #####
-
-        # Special hack for a capital K: replace with Ki. In the early days of
-        # computing, K (capitalized) unambiguously distinguished the power of
-        # two value (modern Kibi) from its SI equivalent (kilo).
-        if prefix == 'K':
-            prefix = 'Ki'
-        #
-
-        self.size = 0
-        if len(accumulator) > 0:
-            self.size = float(accumulator)
-        #
-
-        if prefix in IEC:
-            self.size *= 2**IEC[prefix]
-        elif prefix in SI:
-            self.size *= 10**SI[prefix]
-        #
-
-        self.size = int(self.size)
-
-        # Workaround for fractional bits and bits that don't align with
-        # byte boundaries:
-        if unit == BITS:
-            total = self.size // BITS
-            if self.size % BITS != 0:
-                total += 1
-            #
-            self.size = total
-        #
-
+        self.size = _parse_size(size_string)
         return self.size
     #
     def human_size(self, prefixes=IEC, places=2, unit=BYTES, force=None):
@@ -150,13 +162,29 @@ class DataSize:
         in the specified prefixes table. To force bytes or bits, set force
         to an empty string.
         '''
-        log = math.log10 if prefixes == SI else math.log2
         base = 10 if prefixes == SI else 2
         suffix = 'b' if unit == BITS else 'B'
 
+        # Use the precomputed dividend table for the standard prefixes, and
+        # fall back to computing one for a caller-supplied table.
+        if prefixes is IEC:
+            dividends = _IEC_DIVIDENDS
+        elif prefixes is SI:
+            dividends = _SI_DIVIDENDS
+        else:
+            dividends = { entry: base**prefixes[entry] for entry in prefixes }
+        #
+
         magnitude = 1
         if self.size > 0:
-            magnitude = log(self.size)
+            if base == 10:
+                magnitude = math.log10(self.size)
+            else:
+                # For power-of-two buckets, bit_length() gives the exact
+                # floor of log2 in integer arithmetic, with no
+                # floating-point log evaluation.
+                magnitude = int(self.size).bit_length() - 1
+            #
         #
         dividend = 1
         prefix = ''
@@ -166,7 +194,7 @@ class DataSize:
                 pass   # Use the defaults and output in base units
             elif force in prefixes:
                 prefix = force
-                dividend = base**prefixes[force]
+                dividend = dividends[force]
             else:
                 raise ValueError('No matching forced prefix found')
             #
@@ -176,18 +204,37 @@ class DataSize:
                     break
                 #
                 prefix = entry
-                dividend = base**prefixes[entry]
+                dividend = dividends[entry]
             #
         #
 
         friendly = ''
+        num = self.size * unit
         if prefix == '' and unit == BITS:
             # There are no fractional bits, so output based on an int
-            friendly = str(self.size * unit)
+            friendly = str(num)
         elif places >= 0:
-            friendly = str(round((self.size * unit) / dividend, places))
+            if type(num) is int:
+                # Integer path: scale by the requested precision, round
+                # half-up, and format directly, avoiding floating-point
+                # division and its double-rounding artifacts. Trailing
+                # zeros are stripped (keeping one digit) to match the
+                # float repr the old code produced.
+                shift = 10**places
+                scaled = (num * shift * 2 + dividend) // (dividend * 2)
+                whole, frac = divmod(scaled, shift)
+                if places > 0:
+                    friendly = str(whole) + '.' + str(frac).rjust(places, '0')
+                    friendly = friendly.rstrip('0')
+                    if friendly[-1] == '.':
+                        friendly += '0'
+                    #
+                else:
+                    friendly = str(whole) + '.0'
+            else:
+                friendly = str(round(num / dividend, places))
         else:
-            friendly = str((self.size * unit) / dividend)
+            friendly = str(num / dividend)
         #
 
         friendly += ' ' + prefix + suffix
@@ -196,6 +243,16 @@ class DataSize:
 #
 
 
+@functools.lru_cache(maxsize=1024)
+def _human_size_cached(size_in_bytes, si, places, unit, force):
+    '''
+    Memoized rendering for the standard prefix tables, keyed on the raw
+    arguments (with the table reduced to an SI/IEC flag so the key stays
+    hashable).
+    '''
+    return DataSize(size_in_bytes).human_size(SI if si else IEC, places, unit, force)
+#
+
 def human_size(size_in_bytes, prefixes=IEC, places=2, unit=BYTES, force=None):
     '''
     Returns a string containing a human-readable size expression
@@ -210,15 +267,22 @@ def human_size(size_in_bytes, prefixes=IEC, places=2, unit=BYTES, force=None):
     Gi, Ti, Pi, Ei, Zi, and Yi. Valid SI prefixes are k, M, G, T, P, E, Z,
     and Y. Note the SI prefix "kilo" uses a lowercase k! The IEC equivalent
     to uppercase K is Ki. Set force to an empty string to force base units.
+
+    Results for the standard prefix tables are memoized, since the same
+    sizes tend to be rendered repeatedly.
     '''
-    return DataSize(size_in_bytes).human_size(prefixes, places, unit)
+    if prefixes is IEC or prefixes is SI:
+        return _human_size_cached(size_in_bytes, prefixes is SI, places, unit, force)
+    #
+    return DataSize(size_in_bytes).human_size(prefixes, places, unit, force)
 #
 
 def get_size(size_string):
     '''
     Returns the number of bytes represented by the given human size string.
+    Repeated calls with the same string are served from a cache.
     '''
-    return DataSize().parse_size(size_string)
+    return _parse_size(size_string)
 #
 
 